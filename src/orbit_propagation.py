@@ -1,16 +1,63 @@
-from poliastro.twobody import Orbit 
-from astropy import units as u 
-from astropy.time import Time 
-from poliastro.bodies import Earth 
-from poliastro.twobody.propagation import propagate 
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+import asyncio
+import functools
+import hashlib
+import math
+import mmap
 import os
-import json
+import re
 from datetime import datetime, timedelta
 
 # Celestrak API URLs
 CELESTRAK_URL = "https://celestrak.org/NORAD/elements/gp.php"
 
+# Maximum number of concurrent Celestrak downloads
+MAX_CONCURRENT_FETCHES = 8
+
+# Shared HTTP session so category downloads reuse keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+# Returned by fetch_celestrak_tle when the cached copy is still current
+NOT_MODIFIED = object()
+
+# Width of TLE line 1 and line 2
+TLE_LINE_LENGTH = 69
+
+# cbrt(8681663 / (2 pi / 86400) ** 2): turns mean motion in revolutions per
+# day into the approximate semi-major axis used for altitude estimates
+_SEMI_MAJOR_AXIS_SCALE = (8681663.0 * (86400.0 / math.tau) ** 2) ** (1 / 3)
+
+# Version of the .parsed.npz column layout, bump whenever the columns or
+# the values derived by the parser change so older caches are not served
+PARSED_CACHE_FORMAT = 1
+
+# Resolution of the Kepler's equation lookup table over mean anomaly and
+# eccentricity
+KEPLER_GRID_M_BINS = 2048
+KEPLER_GRID_E_BINS = 128
+KEPLER_GRID_E_MAX = 0.99
+KEPLER_NEWTON_STEPS = 2
+
+# Name fragments marking an object as debris
+_DEBRIS_RE = re.compile(r"deb(?:ris)?|r/b|rocket", re.IGNORECASE)
+
+# Country codes that may prefix an international designator
+COUNTRY_CODES = {
+    "US": "USA",
+    "CIS": "Russia",
+    "PRC": "China",
+    "ESA": "ESA",
+    "FR": "France",
+    "JP": "Japan",
+    "IN": "India",
+    "CA": "Canada",
+    "UK": "UK"
+}
+
 # Categories of space objects to track
 SATELLITE_CATEGORIES = {
     "active": "active",
@@ -37,22 +84,63 @@ DEBRIS_CATEGORIES = {
     "fengyun-1c-debris": "fengyun-1c-debris"
 }
 
+# Function to build conditional request headers from cached validators
+def _conditional_headers(cache_meta):
+    """Build conditional request headers from cached validators
+    
+    Args:
+        cache_meta (dict): Validators of the cached copy, or None
+        
+    Returns:
+        dict: If-None-Match / If-Modified-Since headers to send
+    """
+    headers = {}
+    if cache_meta:
+        if cache_meta.get("etag"):
+            headers["If-None-Match"] = cache_meta["etag"]
+        if cache_meta.get("last_modified"):
+            headers["If-Modified-Since"] = cache_meta["last_modified"]
+    
+    return headers
+
+# Function to record the validators of a fresh response
+def _update_cache_meta(cache_meta, headers):
+    """Record the validators of a fresh response
+    
+    Args:
+        cache_meta (dict): Validators to replace, or None to skip
+        headers (Mapping): Response headers
+    """
+    if cache_meta is not None:
+        cache_meta.clear()
+        cache_meta["etag"] = headers.get("ETag")
+        cache_meta["last_modified"] = headers.get("Last-Modified")
+
 # Function to fetch TLE data from Celestrak
-def fetch_celestrak_tle(category, format_type="tle"):
+def fetch_celestrak_tle(category, format_type="tle", session=_SESSION, cache_meta=None):
     """Fetch TLE data from Celestrak for a specific category
     
     Args:
         category (str): Category of space objects to fetch
         format_type (str): Format of the data (tle, json, csv, etc.)
+        session (requests.Session): HTTP session to issue the request on
+        cache_meta (dict): Validators of the cached copy, sent as a
+            conditional request and replaced with the server's new ones
         
     Returns:
-        str or dict: TLE data in the requested format
+        str or dict: TLE data in the requested format, NOT_MODIFIED if the
+            cached copy is still current
     """
     params = {"GROUP": category, "FORMAT": format_type}
     
     try:
-        response = requests.get(CELESTRAK_URL, params=params)
+        response = session.get(CELESTRAK_URL, params=params, headers=_conditional_headers(cache_meta), timeout=30)
+        
+        if response.status_code == 304:
+            return NOT_MODIFIED
+        
         response.raise_for_status()
+        _update_cache_meta(cache_meta, response.headers)
         
         if format_type == "json":
             return response.json()
@@ -62,6 +150,45 @@ def fetch_celestrak_tle(category, format_type="tle"):
         print(f"Error fetching TLE data: {e}")
         return None
 
+# Function to fetch TLE data for many categories concurrently
+async def fetch_celestrak_tle_all(jobs):
+    """Fetch TLE data from Celestrak for many categories concurrently
+    
+    All requests share one event loop and one connection pool.
+    
+    Args:
+        jobs (list): (category, cache_meta) pairs, with cache_meta as in
+            fetch_celestrak_tle
+        
+    Returns:
+        list: TLE data, NOT_MODIFIED or None for each job, in order
+    """
+    import aiohttp
+    
+    async def fetch(session, category, cache_meta):
+        params = {"GROUP": category, "FORMAT": "tle"}
+        
+        try:
+            async with session.get(CELESTRAK_URL, params=params, headers=_conditional_headers(cache_meta)) as response:
+                if response.status == 304:
+                    return NOT_MODIFIED
+                
+                response.raise_for_status()
+                _update_cache_meta(cache_meta, response.headers)
+                
+                return await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching TLE data: {e}")
+            return None
+    
+    connector = aiohttp.TCPConnector(limit_per_host=MAX_CONCURRENT_FETCHES)
+    # Per-socket limits like requests' timeout=30; a cap on the whole request
+    # would also count time queued for a connection and long downloads
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+    
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        return await asyncio.gather(*(fetch(session, category, cache_meta) for category, cache_meta in jobs))
+
 # Function to save TLE data to a file
 def save_tle_data(data, filename):
     """Save TLE data to a file
@@ -77,6 +204,60 @@ def save_tle_data(data, filename):
     
     print(f"TLE data saved to {filename}")
 
+# Function to get the cache metadata file of a TLE file
+def _meta_filename(filename):
+    """Get the cache metadata file of a TLE file
+    
+    Args:
+        filename (str): Name of the TLE file
+        
+    Returns:
+        str: Name of the metadata file stored next to it
+    """
+    return f"{os.path.splitext(filename)[0]}.meta.json"
+
+# Function to load the HTTP validators of a cached TLE file
+def load_cache_meta(filename):
+    """Load the HTTP validators of a cached TLE file
+    
+    Args:
+        filename (str): Name of the TLE file
+        
+    Returns:
+        dict: Cached validators, empty if there is no cached copy or the
+            metadata file cannot be read
+    """
+    meta_file = _meta_filename(filename)
+    
+    if not os.path.exists(filename) or not os.path.exists(meta_file):
+        return {}
+    
+    # Unreadable metadata only costs an unconditional request
+    try:
+        with open(meta_file, 'rb') as f:
+            cache_meta = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        print(f"Ignoring unreadable cache metadata {meta_file}: {e}")
+        return {}
+    
+    return cache_meta if isinstance(cache_meta, dict) else {}
+
+# Function to save the HTTP validators of a cached TLE file
+def save_cache_meta(cache_meta, filename):
+    """Save the HTTP validators of a cached TLE file
+    
+    Args:
+        cache_meta (dict): Validators returned by the server
+        filename (str): Name of the TLE file
+    """
+    meta_file = _meta_filename(filename)
+    
+    # Write to a temporary file first so an interrupted run cannot leave a
+    # truncated metadata file behind
+    with open(f"{meta_file}.tmp", 'wb') as f:
+        f.write(orjson.dumps(cache_meta))
+    os.replace(f"{meta_file}.tmp", meta_file)
+
 # Function to check if TLE data needs to be updated
 def needs_update(filename, update_interval_hours=24):
     """Check if TLE data needs to be updated
@@ -96,6 +277,382 @@ def needs_update(filename, update_interval_hours=24):
     
     return (current_time - file_time) > timedelta(hours=update_interval_hours)
 
+# Function to slice a fixed-width TLE column out of a batch of lines
+def _tle_column(raw, start, end):
+    """Slice a fixed-width column out of a batch of TLE lines
+    
+    Args:
+        raw (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE lines
+        start (int): First column of the field
+        end (int): Column after the last column of the field
+        
+    Returns:
+        np.ndarray: (N,) bytes array holding the field of every line
+    """
+    return np.ascontiguousarray(raw[:, start:end]).view(f"S{end - start}").ravel()
+
+# Function to convert a column of TLE fields to floats
+def _tle_floats(raw, start, end):
+    """Convert a fixed-width column of TLE fields to floats
+    
+    Malformed fields are detected from their bytes up front, so the
+    conversion itself never raises.
+    
+    Args:
+        raw (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE lines
+        start (int): First column of the field
+        end (int): Column after the last column of the field
+        
+    Returns:
+        np.ndarray: float64 array, NaN where a field is malformed
+    
+    Example:
+        A NUL is only padding at the end of a short line, anywhere else
+        it makes the field malformed:
+        
+        >>> raw = np.array([list(b" 51.6"), list(b"51.6") + [0], [0] + list(b"51.6")], dtype=np.uint8)
+        >>> _tle_floats(raw, 0, 5)
+        array([51.6, 51.6,  nan])
+    """
+    # One row per character position, so the checks below are contiguous
+    # and reduce across records instead of along short strided rows
+    field = np.ascontiguousarray(raw[:, start:end].T)
+    is_digit = (field >= ord("0")) & (field <= ord("9"))
+    is_point = field == ord(".")
+    is_nul = field == 0
+    is_blank = (field == ord(" ")) | is_nul
+    
+    # NULs pad lines shorter than TLE_LINE_LENGTH, so only more NULs may
+    # follow one; the float conversion would reject any other byte after it
+    stray_nul = (np.logical_or.accumulate(is_nul, axis=0) & ~is_nul).any(axis=0)
+    
+    # Blanks are only allowed as padding around the number
+    position = np.arange(end - start)[:, None]
+    first = np.argmax(~is_blank, axis=0)
+    last = end - start - 1 - np.argmax(~is_blank[::-1], axis=0)
+    inner_blank = is_blank & (position > first) & (position < last)
+    
+    # Unsigned decimal numbers: digits and at most one decimal point
+    valid = (
+        (is_digit | is_point | is_blank).all(axis=0)
+        & is_digit.any(axis=0)
+        & (is_point.sum(axis=0) <= 1)
+        & ~inner_blank.any(axis=0)
+        & ~stray_nul
+    )
+    
+    return np.where(valid, _tle_column(raw, start, end), b"nan").astype(np.float64)
+
+# Function to derive period and altitude from mean motion
+def _orbital_parameters(mean_motion):
+    """Derive period and altitude from mean motion
+    
+    Args:
+        mean_motion (np.ndarray): Mean motion in revolutions per day
+        
+    Returns:
+        tuple: Orbital period in minutes and approximate altitude in km
+    """
+    # Orbital period in minutes
+    period_minutes = 1440.0 / mean_motion
+    
+    # Calculate approximate altitude (km)
+    # Using simplified calculation based on mean motion
+    semi_major_axis = _SEMI_MAJOR_AXIS_SCALE / np.cbrt(mean_motion * mean_motion)
+    altitude = semi_major_axis / 1000.0 - 6371.0  # Earth radius is ~6371 km
+    
+    return period_minutes, altitude
+
+# Function to decode the numeric fields of a batch of TLEs
+def _parse_numeric(raw1, raw2):
+    """Decode the numeric fields of a batch of TLEs
+    
+    Runs straight through every record without validation branches;
+    records with a malformed field are only flagged in the error mask.
+    
+    Args:
+        raw1 (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE line 1
+        raw2 (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE line 2
+        
+    Returns:
+        tuple: Dictionary of (N,) arrays keyed by field name, and an (N,)
+            bool mask of malformed records
+    """
+    # Epoch (year and day)
+    epoch_year = _tle_floats(raw1, 18, 20)
+    epoch_year = np.where(epoch_year < 57, epoch_year + 2000, epoch_year + 1900)
+    epoch_day = _tle_floats(raw1, 20, 32)
+    
+    # Mean motion (revolutions per day), eccentricity (implied leading
+    # decimal point) and inclination (degrees)
+    mean_motion = _tle_floats(raw2, 52, 63)
+    eccentricity = _tle_floats(raw2, 26, 33) / 1e7
+    inclination = _tle_floats(raw2, 8, 16)
+    
+    # TLE lines are plain ASCII, anything else marks a corrupt record
+    non_ascii = (raw1 >= 0x80).any(axis=1) | (raw2 >= 0x80).any(axis=1)
+    
+    errors = (
+        np.isnan(epoch_year) | np.isnan(epoch_day) | np.isnan(eccentricity) | np.isnan(inclination)
+        | np.isnan(mean_motion) | (mean_motion <= 0) | non_ascii
+    )
+    
+    # Substitute harmless values in flagged records so the derived
+    # quantities below stay finite
+    epoch_year = np.where(errors, 1970, epoch_year)
+    epoch_day = np.where(errors, 1, epoch_day)
+    mean_motion = np.where(errors, 1, mean_motion)
+    
+    # Calculate epoch date
+    year_start = (epoch_year - 1970).astype(np.int64).astype("datetime64[Y]").astype("datetime64[us]")
+    epoch = year_start + np.round((epoch_day - 1) * 86400e6).astype("timedelta64[us]")
+    
+    period_minutes, altitude = _orbital_parameters(mean_motion)
+    
+    return {
+        "epoch": epoch,
+        "period_minutes": period_minutes,
+        "inclination": inclination,
+        "eccentricity": eccentricity,
+        "altitude": altitude
+    }, errors
+
+# Function to drop flagged records from a column table
+def _postfilter(table, errors):
+    """Drop flagged records from a column table
+    
+    Args:
+        table (dict): Arrays of equal length keyed by field name
+        errors (np.ndarray): bool mask of records to drop
+        
+    Returns:
+        dict: Table holding only the unflagged records
+    """
+    keep = ~errors
+    
+    return {field: column[keep] for field, column in table.items()}
+
+# Function to decode a batch of TLE records into orbital element columns
+def _decode_tle_records(names, raw1, raw2):
+    """Decode a batch of TLE records into orbital element columns
+    
+    Args:
+        names (np.ndarray): (N,) object names
+        raw1 (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE line 1
+        raw2 (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE line 2
+        
+    Returns:
+        tuple: Dictionary of arrays keyed by field name, holding only the
+            well-formed records, and an (N,) bool mask of malformed records
+    """
+    numeric, errors = _parse_numeric(raw1, raw2)
+    for i in np.flatnonzero(errors):
+        print(f"Error parsing TLE data for {names[i]}")
+    
+    # Drop flagged records before building the string columns; what is
+    # left is plain ASCII, so a cast does the work of a per-element decode
+    keep = ~errors
+    names, raw1, raw2 = names[keep], raw1[keep], raw2[keep]
+    numeric = _postfilter(numeric, errors)
+    
+    # Determine object type (satellite or debris)
+    # This is a simple heuristic - in reality, you'd need a more sophisticated method
+    # The names are scanned in one pass over their concatenation, and every
+    # match is mapped back to the name it starts in
+    name_list = names.tolist()
+    lengths = np.fromiter(map(len, name_list), dtype=np.intp, count=len(name_list))
+    starts = np.cumsum(lengths + 1) - (lengths + 1)
+    matches = np.fromiter((match.start() for match in _DEBRIS_RE.finditer("\n".join(name_list))), dtype=np.intp)
+    is_debris = np.zeros(len(name_list), dtype=bool)
+    is_debris[np.searchsorted(starts, matches, side="right") - 1] = True
+    
+    return {
+        "name": names,
+        "norad_id": np.char.strip(_tle_column(raw1, 2, 7)).astype("U5"),
+        "int_designator": np.char.strip(_tle_column(raw1, 9, 17)).astype("U8"),
+        "epoch": numeric["epoch"],
+        "period_minutes": numeric["period_minutes"],
+        "inclination": numeric["inclination"],
+        "eccentricity": numeric["eccentricity"],
+        "type": np.where(is_debris, "debris", "satellite"),
+        "altitude": numeric["altitude"],
+        "tle_line1": _tle_column(raw1, 0, TLE_LINE_LENGTH).astype(f"U{TLE_LINE_LENGTH}"),
+        "tle_line2": _tle_column(raw2, 0, TLE_LINE_LENGTH).astype(f"U{TLE_LINE_LENGTH}")
+    }, errors
+
+# Function to build lookup keys for TLE records
+def _record_keys(raw1, raw2):
+    """Build lookup keys for TLE records
+    
+    Args:
+        raw1 (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE line 1
+        raw2 (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE line 2
+        
+    Returns:
+        np.ndarray: (N,) bytes array holding both lines of each record
+    """
+    return np.hstack([raw1, raw2]).view(f"S{2 * TLE_LINE_LENGTH}").ravel()
+
+# Function to find TLE records that were already parsed
+def _match_previous_records(names, raw1, raw2, previous):
+    """Find TLE records that were already parsed
+    
+    Args:
+        names (np.ndarray): (N,) object names
+        raw1 (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE line 1
+        raw2 (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE line 2
+        previous (dict): Table from an earlier parse, or None
+        
+    Returns:
+        tuple: (N,) bool mask of records with an identical name and lines
+            in the previous table, and (N,) row index into that table
+    """
+    count = len(names)
+    if previous is None or len(previous["name"]) == 0:
+        return np.zeros(count, dtype=bool), np.zeros(count, dtype=np.intp)
+    
+    previous_lines = [
+        previous[field].astype(f"S{TLE_LINE_LENGTH}").view(np.uint8).reshape(-1, TLE_LINE_LENGTH)
+        for field in ("tle_line1", "tle_line2")
+    ]
+    previous_keys = _record_keys(*previous_lines)
+    keys = _record_keys(raw1, raw2)
+    
+    # Binary search every key among the sorted previous keys
+    order = np.argsort(previous_keys)
+    position = np.minimum(np.searchsorted(previous_keys, keys, sorter=order), len(order) - 1)
+    source = order[position]
+    
+    return (previous_keys[source] == keys) & (previous["name"][source] == names), source
+
+# Function to parse a batch of TLE records into orbital element columns
+def _parse_tle_records(names, raw1, raw2, previous=None):
+    """Parse a batch of TLE records into orbital element columns
+    
+    Args:
+        names (np.ndarray): (N,) object names
+        raw1 (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE line 1
+        raw2 (np.ndarray): (N, TLE_LINE_LENGTH) uint8 matrix of TLE line 2
+        previous (dict): Table from an earlier parse of the same category;
+            records whose name and lines are unchanged are copied from it
+            instead of being decoded again
+        
+    Returns:
+        dict: Arrays of equal length keyed by field name
+    """
+    reused, source = _match_previous_records(names, raw1, raw2, previous)
+    decode = ~reused
+    table, decode_errors = _decode_tle_records(names[decode], raw1[decode], raw2[decode])
+    
+    # Malformed records are already missing from the decoded table
+    keep = np.ones(len(names), dtype=bool)
+    keep[decode] = ~decode_errors
+    reused, source = reused[keep], source[keep]
+    
+    if reused.any():
+        merged = {}
+        for field, column in table.items():
+            reused_column = previous[field][source[reused]]
+            merged[field] = np.empty(len(reused), dtype=np.result_type(column, reused_column))
+            merged[field][reused] = reused_column
+            merged[field][~reused] = column
+        table = merged
+    
+    return table
+
+# Function to parse TLE data into orbital element columns
+def _parse_tle_columns(tle_data, previous=None):
+    """Parse TLE data into orbital element columns
+    
+    Args:
+        tle_data (str): TLE data to parse
+        previous (dict): Table from an earlier parse, see _parse_tle_records
+        
+    Returns:
+        dict: Arrays of equal length keyed by field name
+    """
+    tle_data = tle_data.strip()
+    lines = tle_data.split('\n')
+    
+    # Process three lines at a time (name, line1, line2)
+    count = len(lines) // 3
+    names = np.array([line.strip() for line in lines[0:3 * count:3]], dtype=str)
+    
+    # Encoded in one go; a non-ASCII character only shows up as high bytes
+    # in its own line, which _parse_numeric then flags
+    encoded = tle_data.encode("utf-8", errors="replace").split(b'\n')
+    raw1 = np.array(
+        [line.strip() for line in encoded[1:3 * count:3]], dtype=f"S{TLE_LINE_LENGTH}"
+    ).view(np.uint8).reshape(count, TLE_LINE_LENGTH)
+    raw2 = np.array(
+        [line.strip() for line in encoded[2:3 * count:3]], dtype=f"S{TLE_LINE_LENGTH}"
+    ).view(np.uint8).reshape(count, TLE_LINE_LENGTH)
+    
+    return _parse_tle_records(names, raw1, raw2, previous)
+
+# Function to parse a TLE file into orbital element columns
+def _parse_tle_file(filename, previous=None):
+    """Parse a TLE file into orbital element columns
+    
+    Files where every record has the same layout (padded name, line 1,
+    line 2, same line endings) are parsed straight out of a memory map by
+    fixed byte offsets. Anything else goes through the text parser.
+    
+    Args:
+        filename (str): Name of the TLE file
+        previous (dict): Table from an earlier parse, see _parse_tle_records
+        
+    Returns:
+        dict: Arrays of equal length keyed by field name, or None if the
+            file is empty
+    """
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        
+        # Not closed explicitly: the arrays below borrow its buffer, and it
+        # is released together with them when this function returns
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    data = np.frombuffer(mm, dtype=np.uint8)
+    
+    # Derive the record stride from the first name line
+    name_end = mm.find(b"\n")
+    eol = 2 if name_end > 0 and mm[name_end - 1] == ord("\r") else 1
+    name_width = name_end - (eol - 1)
+    stride = name_width + 2 * TLE_LINE_LENGTH + 3 * eol
+    
+    if name_end >= 0 and len(data) % stride == 0:
+        records = data.reshape(-1, stride)
+        line1_start = name_width + eol
+        line2_start = line1_start + TLE_LINE_LENGTH + eol
+        
+        # Every record must have its line breaks and line numbers in place
+        fixed = (
+            (records[:, line1_start] == ord("1")).all()
+            & (records[:, line2_start] == ord("2")).all()
+            & (records[:, line1_start - 1] == ord("\n")).all()
+            & (records[:, line2_start - 1] == ord("\n")).all()
+            & (records[:, stride - 1] == ord("\n")).all()
+        )
+        if eol == 2:
+            fixed &= (
+                (records[:, line1_start - 2] == ord("\r")).all()
+                & (records[:, line2_start - 2] == ord("\r")).all()
+                & (records[:, stride - 2] == ord("\r")).all()
+            )
+        
+        if fixed:
+            names = np.char.decode(np.char.strip(_tle_column(records, 0, name_width)), "utf-8", errors="replace")
+            return _parse_tle_records(
+                names,
+                records[:, line1_start:line1_start + TLE_LINE_LENGTH],
+                records[:, line2_start:line2_start + TLE_LINE_LENGTH],
+                previous
+            )
+    
+    return _parse_tle_columns(mm[:].decode("utf-8", errors="replace"), previous)
+
 # Function to parse TLE data into satellite objects
 def parse_tle_data(tle_data):
     """Parse TLE data into satellite objects
@@ -106,72 +663,41 @@ def parse_tle_data(tle_data):
     Returns:
         list: List of satellite dictionaries
     """
-    satellites = []
-    lines = tle_data.strip().split('\n')
+    satellites = _parse_tle_columns(tle_data)
+    # Same format as datetime.isoformat(), which leaves out a zero
+    # microsecond part
+    epoch = satellites["epoch"]
+    whole_seconds = epoch.astype(np.int64) % 1_000_000 == 0
+    epoch_strings = np.datetime_as_string(epoch, unit="us")
+    satellites["epoch"] = np.where(whole_seconds, epoch_strings.astype("U19"), epoch_strings)
     
-    # Process three lines at a time (name, line1, line2)
-    for i in range(0, len(lines), 3):
-        if i + 2 < len(lines):
-            name = lines[i].strip()
-            line1 = lines[i + 1].strip()
-            line2 = lines[i + 2].strip()
-            
-            # Extract basic information from TLE
-            try:
-                # Satellite catalog number
-                norad_id = line1[2:7].strip()
-                
-                # International designator
-                int_designator = line1[9:17].strip()
-                
-                # Epoch (year and day)
-                epoch_year = int(line1[18:20])
-                epoch_year = epoch_year + 2000 if epoch_year < 57 else epoch_year + 1900
-                epoch_day = float(line1[20:32])
-                
-                # Calculate epoch date
-                epoch_date = datetime(epoch_year, 1, 1) + timedelta(days=epoch_day - 1)
-                
-                # Mean motion (revolutions per day)
-                mean_motion = float(line2[52:63])
-                
-                # Orbital period in minutes
-                period_minutes = 1440.0 / mean_motion if mean_motion > 0 else 0
-                
-                # Eccentricity
-                eccentricity = float("0." + line2[26:33])
-                
-                # Inclination (degrees)
-                inclination = float(line2[8:16])
-                
-                # Determine object type (satellite or debris)
-                # This is a simple heuristic - in reality, you'd need a more sophisticated method
-                is_debris = any(debris_cat in name.lower() for debris_cat in ["deb", "debris", "r/b", "rocket"])
-                
-                # Calculate approximate altitude (km)
-                # Using simplified calculation based on mean motion
-                semi_major_axis = (8681663.0 / (mean_motion * 2 * 3.14159 / 86400.0) ** 2) ** (1/3)
-                altitude = semi_major_axis / 1000.0 - 6371.0  # Earth radius is ~6371 km
-                
-                satellite = {
-                    "name": name,
-                    "norad_id": norad_id,
-                    "int_designator": int_designator,
-                    "epoch": epoch_date.isoformat(),
-                    "period_minutes": period_minutes,
-                    "inclination": inclination,
-                    "eccentricity": eccentricity,
-                    "type": "debris" if is_debris else "satellite",
-                    "altitude": altitude,
-                    "tle_line1": line1,
-                    "tle_line2": line2
-                }
-                
-                satellites.append(satellite)
-            except Exception as e:
-                print(f"Error parsing TLE data for {name}: {e}")
+    return _table_records(satellites)
+
+# Function to turn a column table into a list of row dictionaries
+def _table_records(table):
+    """Turn a column table into a list of row dictionaries
+    
+    Args:
+        table (dict): Arrays of equal length keyed by field name
+        
+    Returns:
+        list: One dictionary per row, holding plain Python values
+    """
+    fields = list(table)
+    
+    return [dict(zip(fields, row)) for row in zip(*(np.asarray(table[field]).tolist() for field in fields))]
+
+# Function to concatenate column tables
+def _concat_tables(tables):
+    """Concatenate column tables with the same fields
     
-    return satellites
+    Args:
+        tables (list): Column tables to concatenate
+        
+    Returns:
+        dict: Single column table holding every row
+    """
+    return {field: np.concatenate([table[field] for table in tables]) for field in tables[0]}
 
 # Function to load TLE data from a file
 def load_tle_data(filename):
@@ -189,65 +715,152 @@ def load_tle_data(filename):
     with open(filename, 'r') as f:
         return f.read()
 
-# Function to convert satellite dictionary to SpaceObject format
-def to_space_object(satellite):
-    """Convert satellite dictionary to SpaceObject format
+# Function to fingerprint the content of a file
+def _file_digest(filename):
+    """Fingerprint the content of a file
     
     Args:
-        satellite (dict): Satellite dictionary
+        filename (str): Name of the file to fingerprint
         
     Returns:
-        dict: SpaceObject dictionary
+        str: Hex digest of the file's bytes
     """
-    # Determine country from international designator
-    country_codes = {
-        "US": "USA",
-        "CIS": "Russia",
-        "PRC": "China",
-        "ESA": "ESA",
-        "FR": "France",
-        "JP": "Japan",
-        "IN": "India",
-        "CA": "Canada",
-        "UK": "UK"
-    }
+    with open(filename, 'rb') as f:
+        # Empty files cannot be memory-mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.blake2b(digest_size=16).hexdigest()
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.blake2b(mm, digest_size=16).hexdigest()
+
+# Function to load the parsed column table of a TLE file
+def load_parsed_tle_data(filename):
+    """Load the parsed column table of a TLE file
+    
+    The table is cached next to the TLE file and only reparsed when the
+    file's content changes, so a re-downloaded but identical file is not
+    parsed again. When it does change, only the records that differ from
+    the cached table are decoded.
+    
+    Args:
+        filename (str): Name of the TLE file
+        
+    Returns:
+        dict: Satellite columns as returned by _parse_tle_columns, or None
+            if there is no TLE data
+    """
+    if not os.path.exists(filename):
+        return None
+    
+    parsed_file = f"{os.path.splitext(filename)[0]}.parsed.npz"
+    digest = _file_digest(filename)
+    
+    # Tables written in another format are ignored entirely, their rows
+    # cannot be mixed with freshly decoded ones
+    previous = None
+    if os.path.exists(parsed_file):
+        try:
+            with np.load(parsed_file) as cached:
+                if "format" in cached.files and cached["format"] == PARSED_CACHE_FORMAT:
+                    previous = {field: cached[field] for field in cached.files if field not in ("digest", "format")}
+                    if cached["digest"] == digest:
+                        return previous
+        except Exception as e:
+            print(f"Ignoring unreadable parse cache {parsed_file}: {e}")
+            previous = None
+    
+    # Records that did not change since the previous parse are reused
+    table = _parse_tle_file(filename, previous)
+    if table is None:
+        return None
+    
+    # Write to a temporary file first so an interrupted run cannot leave a
+    # truncated cache behind
+    with open(f"{parsed_file}.tmp", 'wb') as f:
+        np.savez(f, digest=digest, format=PARSED_CACHE_FORMAT, **table)
+    os.replace(f"{parsed_file}.tmp", parsed_file)
+    
+    return table
+
+# Function to look up the country of many international designators
+def _designator_countries(int_designator):
+    """Look up the country of many international designators
+    
+    Only a leading country code counts. Standard YYNNNPPP designators
+    start with digits and map to "Unknown", so piece letters such as
+    the "CA" in "99025CA" are not taken for a country.
+    
+    Args:
+        int_designator (np.ndarray): International designators
+        
+    Returns:
+        np.ndarray: Country of each designator
+    """
+    raw = np.char.encode(np.asarray(int_designator, dtype=str), "ascii")
+    width = raw.dtype.itemsize
+    raw = raw.view(np.uint8).reshape(len(raw), width)
+    
+    # Keep only the leading run of letters of each designator
+    is_letter = (raw >= ord("A")) & (raw <= ord("Z"))
+    prefix_length = np.where(is_letter.all(axis=1), width, np.argmin(is_letter, axis=1))
+    prefix = np.where(np.arange(width) < prefix_length[:, None], raw, 0).view(f"S{width}").ravel()
+    
+    # One dictionary lookup per distinct prefix
+    codes, inverse = np.unique(prefix, return_inverse=True)
+    countries = np.array([COUNTRY_CODES.get(code.decode("ascii"), "Unknown") for code in codes], dtype=str)
     
-    # Extract launch year and number from international designator
-    int_des = satellite.get("int_designator", "")
-    country = "Unknown"
+    return countries[inverse.ravel()]
+
+# Function to convert a satellite table to SpaceObject format
+def to_space_objects(satellites):
+    """Convert a satellite table to SpaceObject format
     
-    for code, name in country_codes.items():
-        if int_des and code in int_des:
-            country = name
-            break
+    Args:
+        satellites (dict): Satellite columns as returned by _parse_tle_columns
+        
+    Returns:
+        dict: SpaceObject columns
+    """
+    object_type = satellites["type"]
+    altitude = satellites["altitude"]
+    int_designator = satellites["int_designator"]
     
-    # Determine status based on type and other factors
-    status = "active" if satellite["type"] == "satellite" else "inactive"
+    # Determine country from international designator
+    country = _designator_countries(int_designator)
     
     # Determine risk level based on altitude and eccentricity
     # This is a simple heuristic - in reality, you'd need a more sophisticated method
-    risk_level = "low"
-    if satellite["altitude"] < 500:
-        risk_level = "high"
-    elif satellite["altitude"] < 800:
-        risk_level = "medium"
-    
-    # Create SpaceObject
-    space_object = {
-        "id": f"SAT-{satellite['norad_id']}" if satellite["type"] == "satellite" else f"DEB-{satellite['norad_id']}",
-        "name": satellite["name"],
-        "type": satellite["type"],
+    risk_level = np.select([altitude < 500, altitude < 800], ["high", "medium"], default="low")
+    
+    return {
+        "id": np.char.add(np.where(object_type == "satellite", "SAT-", "DEB-"), satellites["norad_id"]),
+        "name": satellites["name"],
+        "type": object_type,
         "country": country,
-        "launchDate": satellite["epoch"].split("T")[0],  # Just the date part
-        "altitude": round(satellite["altitude"], 1),
-        "inclination": round(satellite["inclination"], 1),
-        "period": round(satellite["period_minutes"] / 60, 1),  # Convert to hours
-        "status": status,
+        "launchDate": np.datetime_as_string(np.asarray(satellites["epoch"], dtype="datetime64[us]"), unit="D"),
+        "altitude": np.round(altitude, 1),
+        "inclination": np.round(satellites["inclination"], 1),
+        "period": np.round(satellites["period_minutes"] / 60, 1),  # Convert to hours
+        # Determine status based on type and other factors
+        "status": np.where(object_type == "satellite", "active", "inactive"),
         "riskLevel": risk_level,
-        "lastUpdate": datetime.now().isoformat()
+        "lastUpdate": np.full(len(object_type), datetime.now().isoformat())
     }
+
+# Function to convert satellite dictionary to SpaceObject format
+def to_space_object(satellite):
+    """Convert satellite dictionary to SpaceObject format
     
-    return space_object
+    Args:
+        satellite (dict): Satellite dictionary
+        
+    Returns:
+        dict: SpaceObject dictionary
+    """
+    satellites = {field: np.array([value]) for field, value in satellite.items()}
+    satellites.setdefault("int_designator", np.array([""]))
+    
+    return _table_records(to_space_objects(satellites))[0]
 
 # Function to fetch and update all TLE data
 def update_all_tle_data(data_dir="data/tle", update_interval_hours=24):
@@ -263,67 +876,70 @@ def update_all_tle_data(data_dir="data/tle", update_interval_hours=24):
     updated_categories = {}
     all_space_objects = []
     
-    # Update satellite TLE data
-    for category, value in SATELLITE_CATEGORIES.items():
-        filename = f"{data_dir}/satellites/{category}.txt"
-        
+    # (category, filename, Celestrak group, kind) for every tracked category
+    categories = [
+        (category, f"{data_dir}/satellites/{category}.txt", value, "satellite")
+        for category, value in SATELLITE_CATEGORIES.items()
+    ] + [
+        (category, f"{data_dir}/debris/{category}.txt", value, "debris")
+        for category, value in DEBRIS_CATEGORIES.items()
+    ]
+    
+    # Download stale categories concurrently on one event loop
+    stale = []
+    for category, filename, value, kind in categories:
         if needs_update(filename, update_interval_hours):
-            print(f"Updating {category} satellite TLE data...")
-            tle_data = fetch_celestrak_tle(value)
-            
-            if tle_data:
-                save_tle_data(tle_data, filename)
-                updated_categories[category] = True
-        
-        # Parse TLE data
-        tle_data = load_tle_data(filename)
-        if tle_data:
-            satellites = parse_tle_data(tle_data)
-            for satellite in satellites:
-                space_object = to_space_object(satellite)
-                all_space_objects.append(space_object)
+            print(f"Updating {category} {kind} TLE data...")
+            stale.append((category, filename, value, load_cache_meta(filename)))
     
-    # Update debris TLE data
-    for category, value in DEBRIS_CATEGORIES.items():
-        filename = f"{data_dir}/debris/{category}.txt"
+    if stale:
+        results = asyncio.run(fetch_celestrak_tle_all([(value, cache_meta) for _, _, value, cache_meta in stale]))
         
-        if needs_update(filename, update_interval_hours):
-            print(f"Updating {category} debris TLE data...")
-            tle_data = fetch_celestrak_tle(value)
-            
-            if tle_data:
+        for (category, filename, value, cache_meta), tle_data in zip(stale, results):
+            if tle_data is NOT_MODIFIED:
+                # Cached copy is current, restart its update interval
+                os.utime(filename)
+            elif tle_data:
                 save_tle_data(tle_data, filename)
+                save_cache_meta(cache_meta, filename)
                 updated_categories[category] = True
-        
-        # Parse TLE data
-        tle_data = load_tle_data(filename)
-        if tle_data:
-            debris = parse_tle_data(tle_data)
-            for debris_obj in debris:
-                space_object = to_space_object(debris_obj)
-                all_space_objects.append(space_object)
     
-    # Save all space objects to a JSON file
-    space_objects_file = f"{data_dir}/space_objects.json"
-    with open(space_objects_file, 'w') as f:
-        json.dump(all_space_objects, f, indent=2)
+    # Parse TLE data into one column table per category
+    tables = []
+    for category, filename, value, kind in categories:
+        table = load_parsed_tle_data(filename)
+        if table is not None:
+            tables.append(table)
+    
+    # Build row dictionaries only once, for the JSON output
+    if tables:
+        all_space_objects = _table_records(to_space_objects(_concat_tables(tables)))
+    
+    # Save all space objects to a newline-delimited JSON file
+    space_objects_file = f"{data_dir}/space_objects.ndjson"
+    with open(space_objects_file, 'wb') as f:
+        for space_object in all_space_objects:
+            f.write(orjson.dumps(space_object, option=orjson.OPT_APPEND_NEWLINE))
     
     print(f"Saved {len(all_space_objects)} space objects to {space_objects_file}")
     
     return {"updated": updated_categories, "space_objects": all_space_objects}
 
 # Function to schedule daily updates
-def schedule_daily_updates(data_dir="data/tle", update_hour=3):
+def schedule_daily_updates(data_dir="data/tle", update_hour=3, stop_event=None):
     """Schedule daily updates of TLE data
     
     Args:
         data_dir (str): Directory to save the TLE data to
         update_hour (int): Hour of the day to update (0-23)
+        stop_event (threading.Event): Set to stop the scheduler thread
     """
     import schedule
-    import time
     import threading
     
+    if stop_event is None:
+        stop_event = threading.Event()
+    
     def update_job():
         print(f"Running scheduled update at {datetime.now().isoformat()}")
         result = update_all_tle_data(data_dir)
@@ -332,11 +948,12 @@ def schedule_daily_updates(data_dir="data/tle", update_hour=3):
     # Schedule the update job
     schedule.every().day.at(f"{update_hour:02d}:00").do(update_job)
     
-    # Run the scheduler in a separate thread
+    # Run the scheduler in a separate thread, sleeping until the next job is due
     def run_scheduler():
-        while True:
+        while not stop_event.is_set():
             schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            idle_seconds = schedule.idle_seconds()
+            stop_event.wait(timeout=max(1, idle_seconds) if idle_seconds is not None else 60)
     
     scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
     scheduler_thread.start()
@@ -358,38 +975,179 @@ def get_latest_space_objects(data_dir="data/tle"):
     Returns:
         list: List of space objects
     """
-    space_objects_file = f"{data_dir}/space_objects.json"
+    space_objects_file = f"{data_dir}/space_objects.ndjson"
     
     if not os.path.exists(space_objects_file):
         # If the file doesn't exist, run an update
         result = update_all_tle_data(data_dir)
         return result["space_objects"]
     
-    with open(space_objects_file, 'r') as f:
-        return json.load(f)
+    # One space object per line
+    with open(space_objects_file, 'rb') as f:
+        return [orjson.loads(line) for line in f if line.strip()]
+
+# Function to build the Kepler's equation lookup table
+@functools.lru_cache(maxsize=None)
+def _kepler_table():
+    """Build the Kepler's equation lookup table
+    
+    Built on first use rather than at import, so scripts that never solve
+    Kepler's equation do not pay for it.
+    
+    Only mean anomalies in [0, pi] are tabulated, the other half follows
+    from E(2 pi - M) = 2 pi - E(M). The mean anomaly axis is spaced
+    uniformly in cbrt(M / pi), which packs grid points towards periapsis
+    where E(M) steepens like a cube root at high eccentricity.
+    
+    Returns:
+        np.ndarray: (M_BINS + 1, E_BINS + 1) eccentric anomalies over
+            cbrt(M / pi) in [0, 1] and eccentricity [0, KEPLER_GRID_E_MAX]
+    """
+    mean_anomaly = np.pi * np.linspace(0.0, 1.0, KEPLER_GRID_M_BINS + 1)[:, None] ** 3
+    eccentricity = np.linspace(0.0, KEPLER_GRID_E_MAX, KEPLER_GRID_E_BINS + 1)[None, :]
+    
+    # Newton's method started from pi converges monotonically for any
+    # eccentricity below 1
+    eccentric_anomaly = np.full(np.broadcast(mean_anomaly, eccentricity).shape, np.pi)
+    for _ in range(50):
+        eccentric_anomaly -= (
+            (eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly) - mean_anomaly)
+            / (1 - eccentricity * np.cos(eccentric_anomaly))
+        )
+    
+    return eccentric_anomaly
+
+# Function to solve Kepler's equation for many orbits
+def solve_kepler(mean_anomaly, eccentricity):
+    """Solve Kepler's equation for many orbits
+    
+    Looks the eccentric anomaly up in a precomputed grid with bilinear
+    interpolation, then polishes it with a fixed number of Newton steps.
+    There are no data-dependent branches or iteration counts. The residual
+    of Kepler's equation stays below 1e-10 rad for any eccentricity up to
+    KEPLER_GRID_E_MAX, including M near 0 or 2 pi.
+    
+    Args:
+        mean_anomaly (np.ndarray): Mean anomaly in radians
+        eccentricity (np.ndarray): Eccentricity, at most KEPLER_GRID_E_MAX
+        
+    Returns:
+        np.ndarray: Eccentric anomaly in radians, in [0, 2 pi)
+    """
+    table = _kepler_table()
+    mean_anomaly = np.mod(mean_anomaly, 2 * np.pi)
+    eccentricity = np.asarray(eccentricity, dtype=np.float64)
+    
+    # Fold the second half of the orbit onto [0, pi]
+    upper_half = mean_anomaly > np.pi
+    folded_anomaly = np.where(upper_half, 2 * np.pi - mean_anomaly, mean_anomaly)
+    
+    # Fractional grid coordinates and the cell they fall in
+    m_pos = np.cbrt(folded_anomaly / np.pi) * KEPLER_GRID_M_BINS
+    e_pos = np.clip(eccentricity, 0.0, KEPLER_GRID_E_MAX) * (KEPLER_GRID_E_BINS / KEPLER_GRID_E_MAX)
+    i = np.minimum(m_pos.astype(np.intp), KEPLER_GRID_M_BINS - 1)
+    j = np.minimum(e_pos.astype(np.intp), KEPLER_GRID_E_BINS - 1)
+    m_frac = m_pos - i
+    e_frac = e_pos - j
+    
+    eccentric_anomaly = (
+        (1 - m_frac) * (1 - e_frac) * table[i, j]
+        + m_frac * (1 - e_frac) * table[i + 1, j]
+        + (1 - m_frac) * e_frac * table[i, j + 1]
+        + m_frac * e_frac * table[i + 1, j + 1]
+    )
+    eccentric_anomaly = np.where(upper_half, 2 * np.pi - eccentric_anomaly, eccentric_anomaly)
+    
+    # The interpolated guess is within ~1e-4 rad; Newton converges
+    # quadratically from there
+    for _ in range(KEPLER_NEWTON_STEPS):
+        eccentric_anomaly -= (
+            (eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly) - mean_anomaly)
+            / (1 - eccentricity * np.cos(eccentric_anomaly))
+        )
+    
+    return np.mod(eccentric_anomaly, 2 * np.pi)
 
-# Function to propagate orbit using poliastro
+# Function to propagate orbit using SGP4
 def propagate_orbit(tle_line1, tle_line2, time_delta):
-    """Propagate orbit using poliastro
+    """Propagate orbit using SGP4
     
     Args:
         tle_line1 (str): First line of TLE
         tle_line2 (str): Second line of TLE
-        time_delta (float): Time delta in days
+        time_delta (float): Time delta in days from the TLE epoch
         
     Returns:
-        Orbit: Propagated orbit
+        tuple: Position (km) and velocity (km/s) in the TEME frame
     """
-    from poliastro.twobody.orbit import Orbit
-    from astropy import time
+    from sgp4.api import Satrec, SGP4_ERRORS
     
-    # Create orbit from TLE
-    orbit = Orbit.from_tle(tle_line1, tle_line2)
+    # Create satellite record from TLE
+    satellite = Satrec.twoline2rv(tle_line1, tle_line2)
     
     # Propagate orbit
-    new_orbit = orbit.propagate(time_delta * u.day)
+    error, position, velocity = satellite.sgp4(satellite.jdsatepoch, satellite.jdsatepochF + time_delta)
+    if error:
+        raise RuntimeError(f"SGP4 propagation failed: {SGP4_ERRORS[error]}")
     
-    return new_orbit
+    return np.array(position), np.array(velocity)
+
+# Function to propagate orbit to many epochs using SGP4
+def propagate_orbit_batch(tle_line1, tle_line2, jd, fr):
+    """Propagate orbit to many epochs using SGP4
+    
+    The Julian dates are split into whole and fractional parts as returned
+    by sgp4.api.jday, which keeps full precision over the batch.
+    
+    Args:
+        tle_line1 (str): First line of TLE
+        tle_line2 (str): Second line of TLE
+        jd (np.ndarray): Whole part of the Julian dates
+        fr (np.ndarray): Fractional part of the Julian dates
+        
+    Returns:
+        tuple: (N, 3) positions (km) and velocities (km/s) in the TEME
+            frame, NaN where propagation failed
+    """
+    from sgp4.api import Satrec
+    
+    satellite = Satrec.twoline2rv(tle_line1, tle_line2)
+    errors, positions, velocities = satellite.sgp4_array(
+        np.asarray(jd, dtype=np.float64), np.asarray(fr, dtype=np.float64)
+    )
+    
+    positions[errors != 0] = np.nan
+    velocities[errors != 0] = np.nan
+    
+    return positions, velocities
+
+# Function to propagate many orbits to many epochs using SGP4
+def propagate_all(tles, jd, fr):
+    """Propagate many orbits to many epochs using SGP4
+    
+    Every satellite is propagated to every epoch in a single call into the
+    sgp4 C extension.
+    
+    Args:
+        tles (list): (line1, line2) pairs of the satellites to propagate
+        jd (np.ndarray): Whole part of the Julian dates
+        fr (np.ndarray): Fractional part of the Julian dates
+        
+    Returns:
+        tuple: (N, T, 3) positions (km) and velocities (km/s) in the TEME
+            frame, NaN where propagation failed
+    """
+    from sgp4.api import Satrec, SatrecArray
+    
+    satellites = SatrecArray([Satrec.twoline2rv(line1, line2) for line1, line2 in tles])
+    errors, positions, velocities = satellites.sgp4(
+        np.asarray(jd, dtype=np.float64), np.asarray(fr, dtype=np.float64)
+    )
+    
+    positions[errors != 0] = np.nan
+    velocities[errors != 0] = np.nan
+    
+    return positions, velocities
 
 # Example usage
 if __name__ == "__main__":
@@ -409,15 +1167,25 @@ if __name__ == "__main__":
         print(f"Updated categories: {result['updated']}")
         print(f"Total space objects: {len(result['space_objects'])}")
     elif args.schedule:
+        import signal
+        import threading
+        
         # Schedule daily updates
-        scheduler_thread = schedule_daily_updates(args.data_dir, args.hour)
+        stop_event = threading.Event()
+        scheduler_thread = schedule_daily_updates(args.data_dir, args.hour, stop_event)
         
-        try:
-            # Keep the main thread alive
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print("Stopping scheduler...")
+        # Stop on the first Ctrl-C; a second one falls back to KeyboardInterrupt
+        def handle_sigint(signum, frame):
+            stop_event.set()
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+        
+        # Install only after the initial update so Ctrl-C can still abort it
+        signal.signal(signal.SIGINT, handle_sigint)
+        
+        # Keep the main thread alive until interrupted
+        stop_event.wait()
+        print("Stopping scheduler...")
+        scheduler_thread.join()
     else:
         # Just print the latest space objects
         space_objects = get_latest_space_objects(args.data_dir)
@@ -428,6 +1196,6 @@ if __name__ == "__main__":
         for i, obj in enumerate(space_objects[:5]):
             print(f"{i+1}. {obj['name']} ({obj['type']}) - Altitude: {obj['altitude']} km, Risk: {obj['riskLevel']}")
         
-        # Example of using poliastro with TLE data
-        # orbit = Orbit.circular(Earth, 700 * u.km)
-        # print(orbit)
\ No newline at end of file
+        # Example of propagating TLE data with SGP4
+        # position, velocity = propagate_orbit(tle_line1, tle_line2, 1.0)
+        # print(position, velocity)
\ No newline at end of file